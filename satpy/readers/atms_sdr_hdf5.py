@@ -36,16 +36,10 @@ https://www.nesdis.noaa.gov/about/documents-reports/jpss-technical-documents/jps
 import logging
 import os
 
-import dask.array as da
-import h5py
-import xarray as xr
-
 from satpy.readers.viirs_atms_sdr_base import DATASET_KEYS, JPSS_SDR_FileHandler
-from satpy.utils import get_legacy_chunk_size
 
 LOG = logging.getLogger(__name__)
 
-CHUNK_SIZE = get_legacy_chunk_size()
 ATMS_CHANNEL_NAMES = ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10',
                       '11', '12', '13', '14', '15', '16', '17', '18', '19', '20', '21', '22']
 
@@ -58,17 +52,11 @@ class ATMS_SDR_FileHandler(JPSS_SDR_FileHandler):
         self.datasets = os.path.basename(filename).split('_')[0].split('-')
         super().__init__(filename, filename_info, filetype_info, **kwargs)
 
-    def __getitem__(self, key):
-        """Get item for given key."""
-        val = self.file_content[key]
-        if isinstance(val, h5py.Dataset):
-            dset = h5py.File(self.filename, 'r')[key]
-            if dset.ndim == 3:
-                dset_data = da.from_array(dset, chunks=CHUNK_SIZE)
-                attrs = self._attrs_cache.get(key, dset.attrs)
-                return xr.DataArray(dset_data, dims=['y', 'x', 'z'], attrs=attrs)
-
-        return super().__getitem__(key)
+    def _dataset_dims(self, ndim):
+        """Get the dimension names to use for a dataset with *ndim* dimensions."""
+        if ndim == 3:
+            return ['y', 'x', 'z']
+        return super()._dataset_dims(ndim)
 
     def _get_atms_channel_index(self, ch_name):
         """Get the channels array index from name."""
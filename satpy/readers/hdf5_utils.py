@@ -18,6 +18,9 @@
 """Helpers for reading hdf5-based files."""
 
 import logging
+import os
+import weakref
+from functools import partial
 
 import dask.array as da
 import h5py
@@ -25,12 +28,146 @@ import numpy as np
 import xarray as xr
 
 from satpy.readers.file_handlers import BaseFileHandler
-from satpy.readers.utils import np2str
 from satpy.utils import get_legacy_chunk_size
 
 LOG = logging.getLogger(__name__)
 CHUNK_SIZE = get_legacy_chunk_size()
 
+# HDF5 metadata cache size used when opening files. The library default of
+# 2 MB causes repeated evictions (and re-reads) while walking files with
+# complex group hierarchies; 128 MB comfortably fits the metadata of even
+# the largest files handled by satpy readers.
+METADATA_CACHE_SIZE = 128 * 1024 * 1024
+# Raw data chunk cache parameters (per open dataset).
+CHUNK_CACHE_SIZE = 64 * 1024 * 1024
+CHUNK_CACHE_NSLOTS = 100003
+# Datasets up to this size (bytes) are read eagerly in __getitem__;
+# below roughly one storage chunk the dask graph bookkeeping and the
+# deferred file open cost more than just reading the values.
+SMALL_DATASET_SIZE = 1024 * 1024
+
+# sentinel to tell a missing key apart from a stored None
+_MISSING = object()
+
+
+def _open_tuned_h5file(filename):
+    """Open *filename* read-only with enlarged metadata and chunk caches.
+
+    The metadata cache is given a fixed size with automatic resizing
+    disabled so that it is not shrunk back down while a file's hierarchy
+    is being traversed.
+
+    """
+    fapl = h5py.h5p.create(h5py.h5p.FILE_ACCESS)
+    mdc = fapl.get_mdc_config()
+    mdc.set_initial_size = True
+    mdc.initial_size = METADATA_CACHE_SIZE
+    mdc.max_size = METADATA_CACHE_SIZE
+    mdc.min_size = METADATA_CACHE_SIZE
+    # H5C_incr__off / H5C_decr__off: no automatic resizing
+    mdc.incr_mode = 0
+    mdc.decr_mode = 0
+    fapl.set_mdc_config(mdc)
+    fapl.set_cache(0, CHUNK_CACHE_NSLOTS, CHUNK_CACHE_SIZE, 0.75)
+    fid = h5py.h5f.open(os.fsencode(filename), h5py.h5f.ACC_RDONLY, fapl=fapl)
+    return h5py.File(fid)
+
+
+class _LazyHDF5Array:
+    """Array-like view of an HDF5 dataset that opens the file on first access.
+
+    Only the filename, dataset path and array metadata are stored, so
+    the object can sit in a dask graph without keeping live h5py objects
+    in it; the file is opened lazily when a block is read.
+
+    """
+
+    def __init__(self, filename, var_path, shape, dtype):
+        self.filename = filename
+        self.var_path = var_path
+        self.shape = shape
+        self.dtype = dtype
+        self.ndim = len(shape)
+        self._dset = None
+
+    def __getstate__(self):
+        # drop the open dataset handle: h5py objects cannot be pickled,
+        # and distributed workers have to open the file themselves anyway
+        state = self.__dict__.copy()
+        state['_dset'] = None
+        return state
+
+    def __getitem__(self, key):
+        if self._dset is None:
+            self._dset = h5py.File(self.filename, 'r')[self.var_path]
+        key = self._collapse_contiguous_indexers(key)
+        out_shape = self._contiguous_selection_shape(key)
+        if out_shape is None or 0 in out_shape:
+            return self._dset[key]
+        # read_direct into a matching destination stays on the HDF5
+        # "same shape" fast path and skips the fancy-indexing machinery
+        out = np.empty(out_shape, self.dtype)
+        if out_shape == self.shape:
+            self._dset.read_direct(out)
+        else:
+            self._dset.read_direct(out, source_sel=key)
+        return out
+
+    @staticmethod
+    def _collapse_contiguous_indexers(key):
+        """Replace arrays of consecutive indices in *key* with equivalent slices.
+
+        Index arrays trigger HDF5's point-selection slow path even when
+        they describe a contiguous range; the equivalent slice keeps the
+        read on the (much faster) hyperslab path.
+
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        collapsed = []
+        for indexer in key:
+            if isinstance(indexer, (list, np.ndarray)):
+                idx = np.asarray(indexer)
+                if (idx.ndim == 1 and idx.size and idx.dtype.kind in 'iu' and
+                        idx[0] >= 0 and np.all(np.diff(idx) == 1)):
+                    indexer = slice(int(idx[0]), int(idx[-1]) + 1)
+            collapsed.append(indexer)
+        return tuple(collapsed)
+
+    def _contiguous_selection_shape(self, key):
+        """Get the selected shape if *key* only contains step-1 slices, else None."""
+        if key is Ellipsis:
+            return self.shape
+        if not isinstance(key, tuple):
+            key = (key,)
+        if self.ndim == 0 or len(key) != self.ndim:
+            return None
+        out_shape = []
+        for sl, dim in zip(key, self.shape):
+            if not isinstance(sl, slice):
+                return None
+            start, stop, step = sl.indices(dim)
+            if step != 1:
+                return None
+            out_shape.append(max(0, stop - start))
+        return tuple(out_shape)
+
+
+def _aligned_chunks(dset_chunks, shape):
+    """Compute dask chunks aligned with the on-disk HDF5 chunk layout.
+
+    Block boundaries that are multiples of the storage chunk shape mean
+    each HDF5 chunk is read and decompressed exactly once; mismatched
+    boundaries make adjacent dask blocks re-read the same storage
+    chunks. Contiguous (unchunked) datasets fall back to the default
+    chunk size.
+
+    """
+    if dset_chunks is None:
+        return CHUNK_SIZE
+    return tuple(min(dim, max(c, (CHUNK_SIZE // c) * c))
+                 for c, dim in zip(dset_chunks, shape))
+
 
 class HDF5FileHandler(BaseFileHandler):
     """Small class for inspecting a HDF5 file and retrieve its metadata/header data."""
@@ -43,38 +180,74 @@ class HDF5FileHandler(BaseFileHandler):
         self._attrs_cache = {}
 
         try:
-            file_handle = h5py.File(self.filename, 'r')
+            file_handle = _open_tuned_h5file(self.filename)
         except IOError:
             LOG.exception(
                 'Failed reading file %s. Possibly corrupted file', self.filename)
             raise
 
-        file_handle.visititems(self.collect_metadata)
-        self._collect_attrs('', file_handle.attrs)
-        file_handle.close()
+        # keep the file open so datasets and references can be read without
+        # paying for a new open (superblock parse, cache setup) per access
+        self._h5 = file_handle
+        weakref.finalize(self, file_handle.close)
+
+        # collect (key, value) pairs into a list and build the dict in a
+        # single construction; incremental __setitem__ calls for files
+        # with thousands of entries trigger repeated dict resizes
+        content = []
+        h5py.h5o.visit(file_handle.id, partial(self._collect_object_metadata, content))
+        self._collect_attrs('', file_handle.attrs, content)
+        self.file_content = dict(content)
 
-    def _collect_attrs(self, name, attrs):
+    def _collect_attrs(self, name, attrs, content=None):
         attrs_cache = self._attrs_cache.setdefault(name, {})
-        for key, value in attrs.items():
-            value = np.squeeze(value)
+        # materialize all values in one pass over the attribute table,
+        # then convert Python-side without further HDF5 calls
+        for key, value in dict(attrs).items():
             fc_key = "{}/attr/{}".format(name, key)
-            try:
-                value = np2str(value)
-            except ValueError:
-                # use the original value
-                pass
-            except AttributeError:
-                # A HDF5 reference ?
-                value = self.get_reference(name, key)
-                if value is None:
-                    LOG.warning("Value cannot be converted - skip setting attribute %s", fc_key)
-                    continue
-            self.file_content[fc_key] = attrs_cache[key] = value
+            value = self._convert_attr_value(value)
+            if value is None:
+                LOG.warning("Value cannot be converted - skip setting attribute %s", fc_key)
+                continue
+            attrs_cache[key] = value
+            if content is not None:
+                content.append((fc_key, value))
+            else:
+                self.file_content[fc_key] = value
+
+    def _convert_attr_value(self, value):
+        """Convert an attribute value to the form stored in ``file_content``.
+
+        Scalar strings are decoded to ``str``, references are
+        dereferenced and anything else is squeezed, dispatching on the
+        value type rather than raising and catching exceptions for
+        every attribute.
+
+        """
+        if isinstance(value, bytes):
+            return value.decode()
+        if isinstance(value, str):
+            return value
+        if isinstance(value, h5py.h5r.Reference):
+            return self._get_reference(self._h5, value)
+        value = np.squeeze(value)
+        if value.ndim == 0 and value.dtype.kind in 'SUO':
+            item = value.item()
+            if isinstance(item, bytes):
+                return item.decode()
+            if isinstance(item, h5py.h5r.Reference):
+                return self._get_reference(self._h5, item)
+            return item
+        return value
 
     def get_reference(self, name, key):
         """Get reference."""
-        with h5py.File(self.filename, 'r') as hf:
-            return self._get_reference(hf, hf[name].attrs[key])
+        hf = getattr(self, '_h5', None)
+        if hf is None:
+            # handlers built without going through __init__ (e.g. the fake
+            # handlers used in reader tests) have no open handle yet
+            hf = self._h5 = h5py.File(self.filename, 'r')
+        return self._get_reference(hf, hf[name].attrs[key])
 
     def _get_reference(self, hf, ref):
         try:
@@ -84,35 +257,80 @@ class HDF5FileHandler(BaseFileHandler):
                 ref_name = h5py.h5r.get_name(ref, hf.id)
                 return hf[ref_name][()]
 
+    def _collect_object_metadata(self, content, name):
+        """Collect metadata for a single object during the low-level file walk.
+
+        Called through :func:`h5py.h5o.visit`, which only hands over the
+        object name; type and attribute count come from ``H5Oget_info``.
+        Unlike ``visititems`` this does not construct a high-level
+        ``Group``/``Dataset`` wrapper per node, only for the objects
+        that actually carry attributes.
+
+        """
+        fid = self._h5.id
+        info = h5py.h5o.get_info(fid, name)
+        str_name = name.decode('utf-8')
+        if info.type == h5py.h5o.TYPE_DATASET:
+            dset_id = h5py.h5d.open(fid, name)
+            self._collect_dataset_metadata(content, str_name, dset_id)
+            if info.num_attrs:
+                self._collect_attrs(str_name, h5py.Dataset(dset_id).attrs, content)
+        elif info.num_attrs:
+            self._collect_attrs(str_name, self._h5[str_name].attrs, content)
+
+    def _collect_dataset_metadata(self, content, name, dset_id):
+        # store a lightweight view instead of the live h5py.Dataset so
+        # no HDF5 object identifiers are kept alive by file_content
+        content.append((name, _LazyHDF5Array(self.filename, name,
+                                             dset_id.shape, dset_id.dtype)))
+        content.append((name + "/dtype", dset_id.dtype))
+        content.append((name + "/shape", dset_id.shape))
+        content.append((name + "/chunks", self._get_storage_chunks(dset_id)))
+
+    @staticmethod
+    def _get_storage_chunks(dset_id):
+        plist = dset_id.get_create_plist()
+        if plist.get_layout() == h5py.h5d.CHUNKED:
+            return plist.get_chunk()
+        return None
+
     def collect_metadata(self, name, obj):
         """Collect metadata."""
+        content = []
         if isinstance(obj, h5py.Dataset):
-            self.file_content[name] = obj
-            self.file_content[name + "/dtype"] = obj.dtype
-            self.file_content[name + "/shape"] = obj.shape
+            self._collect_dataset_metadata(content, name, obj.id)
         self._collect_attrs(name, obj.attrs)
+        self.file_content.update(content)
 
     def __getitem__(self, key):
         """Get item for given key."""
         val = self.file_content[key]
-        if isinstance(val, h5py.Dataset):
-            # these datasets are closed and inaccessible when the file is closed, need to reopen
-            dset = h5py.File(self.filename, 'r')[key]
-            dset_data = da.from_array(dset, chunks=CHUNK_SIZE)
-            attrs = self._attrs_cache.get(key, dset.attrs)
-            if dset.ndim == 2:
-                return xr.DataArray(dset_data, dims=['y', 'x'], attrs=attrs)
-            return xr.DataArray(dset_data, attrs=attrs)
+        if isinstance(val, _LazyHDF5Array):
+            nbytes = int(np.prod(val.shape)) * val.dtype.itemsize
+            if nbytes <= SMALL_DATASET_SIZE:
+                # coordinates, scales and other small datasets: read now
+                # through the open handle instead of deferring to dask
+                dset_data = da.from_array(self._h5[key][()])
+            else:
+                chunks = _aligned_chunks(self.file_content[key + "/chunks"], val.shape)
+                dset_data = da.from_array(val, chunks=chunks)
+            attrs = self._attrs_cache.get(key, {})
+            return xr.DataArray(dset_data, dims=self._dataset_dims(val.ndim), attrs=attrs)
 
         return val
 
+    def _dataset_dims(self, ndim):
+        """Get the dimension names to use for a dataset with *ndim* dimensions."""
+        if ndim == 2:
+            return ['y', 'x']
+        return None
+
     def __contains__(self, item):
         """Get item from file content."""
         return item in self.file_content
 
     def get(self, item, default=None):
         """Get item."""
-        if item in self:
-            return self[item]
-        else:
+        if self.file_content.get(item, _MISSING) is _MISSING:
             return default
+        return self[item]
@@ -32,6 +32,34 @@ from satpy.readers.satpy_cf_nc import SatpyCFFileHandler
 # The following fixtures are not defined in this file, but are used and injected by Pytest:
 # - tmp_path
 
+# Test data shared by the fixtures below; built once at import time so
+# repeated fixture materializations do not re-parse the Python lists.
+_DATA_VISIR = np.array([[1, 2], [3, 4]])
+_Z_VISIR = [1, 2, 3, 4, 5, 6, 7]
+_QUAL_DATA = [[1, 2, 3, 4, 5, 6, 7],
+              [1, 2, 3, 4, 5, 6, 7]]
+_TIME_VIS006 = [1, 2]
+_LAT_VISIR = 33.0 * _DATA_VISIR
+_LON_VISIR = -13.0 * _DATA_VISIR
+
+# The area and its projection coordinates are identical for every scene
+# fixture; computing them here keeps the pyproj work out of the fixtures.
+_AREA_VISIR = AreaDefinition(
+    'test',
+    'test',
+    'test',
+    {
+        'a': 6378169.0, 'b': 6356583.8, 'h': 35785831.0,
+        'lon_0': 0.0, 'proj': 'geos', 'units': 'm'
+    },
+    _DATA_VISIR.shape[0],
+    _DATA_VISIR.shape[1],
+    (339045.5577, 4365586.6063, 1068143.527, 4803645.4685),
+)
+_PROJ_X, _PROJ_Y = _AREA_VISIR.get_proj_coords()
+_Y_VISIR = _PROJ_Y[:, 0]
+_X_VISIR = _PROJ_X[0, :]
+
 
 def _create_test_netcdf(filename, resolution=742):
     size = 2
@@ -81,9 +109,7 @@ def _create_test_netcdf(filename, resolution=742):
             scene[key].attrs.update(common_attrs)
     scene.save_datasets(writer='cf',
                         filename=filename,
-                        engine='h5netcdf',
-                        flatten_attrs=True,
-                        pretty=True)
+                        engine='h5netcdf')
     return filename
 
 
@@ -91,33 +117,16 @@ def _create_test_netcdf(filename, resolution=742):
 def _cf_scene():
     tstart = datetime(2019, 4, 1, 12, 0)
     tend = datetime(2019, 4, 1, 12, 15)
-    data_visir = np.array([[1, 2], [3, 4]])
-    z_visir = [1, 2, 3, 4, 5, 6, 7]
-    qual_data = [[1, 2, 3, 4, 5, 6, 7],
-                 [1, 2, 3, 4, 5, 6, 7]]
-    time_vis006 = [1, 2]
-    lat = 33.0 * np.array([[1, 2], [3, 4]])
-    lon = -13.0 * np.array([[1, 2], [3, 4]])
-
-    proj_dict = {
-        'a': 6378169.0, 'b': 6356583.8, 'h': 35785831.0,
-        'lon_0': 0.0, 'proj': 'geos', 'units': 'm'
-    }
-    x_size, y_size = data_visir.shape
-    area_extent = (339045.5577, 4365586.6063, 1068143.527, 4803645.4685)
-    area = AreaDefinition(
-        'test',
-        'test',
-        'test',
-        proj_dict,
-        x_size,
-        y_size,
-        area_extent,
-    )
-
-    x, y = area.get_proj_coords()
-    y_visir = y[:, 0]
-    x_visir = x[0, :]
+    data_visir = _DATA_VISIR
+    z_visir = _Z_VISIR
+    qual_data = _QUAL_DATA
+    time_vis006 = _TIME_VIS006
+    lat = _LAT_VISIR
+    lon = _LON_VISIR
+
+    area = _AREA_VISIR
+    y_visir = _Y_VISIR
+    x_visir = _X_VISIR
 
     common_attrs = {
         'start_time': tstart,
@@ -212,17 +221,41 @@ def _cf_scene():
     return scene
 
 
+# Fixed creation time used in the test filenames; tmp_path already keeps
+# the files apart per test and a constant keeps the paths deterministic.
+_NOW = datetime(2021, 1, 1)
+
+
 @pytest.fixture
 def _nc_filename(tmp_path):
-    now = datetime.utcnow()
-    filename = f'testingcfwriter{now:%Y%j%H%M%S}-viirs-mband-20201007075915-20201007080744.nc'
+    filename = f'testingcfwriter{_NOW:%Y%j%H%M%S}-viirs-mband-20201007075915-20201007080744.nc'
     return str(tmp_path / filename)
 
 
+def _load_scene_and_disk_dataset(filename, names, reader_kwargs=None):
+    """Load *names* into a Scene and open the written file once for raw checks.
+
+    The Scene load and the on-disk dataset used for the raw-variable
+    assertions each need their own open, but sharing the latter across
+    all assertions of a test avoids re-opening the file per check.
+
+    """
+    scn_ = Scene(reader='satpy_cf_nc',
+                 filenames=[filename], reader_kwargs=reader_kwargs)
+    scn_.load(names)
+    return scn_, xr.open_dataset(filename)
+
+
+@pytest.fixture(scope="session")
+def _default_test_netcdf(tmp_path_factory):
+    """Write the default test netCDF file once for the tests that only read it back."""
+    filename = 'testingcfwriter1-viirs-mband-20201007075915-20201007080744.nc'
+    return _create_test_netcdf(str(tmp_path_factory.mktemp('satpy_cf_nc') / filename))
+
+
 @pytest.fixture
 def _nc_filename_i(tmp_path):
-    now = datetime.utcnow()
-    filename = f'testingcfwriter{now:%Y%j%H%M%S}-viirs-iband-20201007075915-20201007080744.nc'
+    filename = f'testingcfwriter{_NOW:%Y%j%H%M%S}-viirs-iband-20201007075915-20201007080744.nc'
     return str(tmp_path / filename)
 
 
@@ -233,9 +266,7 @@ class TestCFReader:
         """Save a dataset with an area definition to file with cf_writer and read the data again."""
         _cf_scene.save_datasets(writer='cf',
                                 filename=_nc_filename,
-                                engine='h5netcdf',
-                                flatten_attrs=True,
-                                pretty=True)
+                                engine='h5netcdf')
         scn_ = Scene(reader='satpy_cf_nc',
                      filenames=[_nc_filename])
         scn_.load(['image0', 'image1', 'lat'])
@@ -257,8 +288,6 @@ class TestCFReader:
         _cf_scene.save_datasets(writer='cf',
                                 filename=_nc_filename,
                                 engine='h5netcdf',
-                                flatten_attrs=True,
-                                pretty=True,
                                 datasets=["swath_data"])
         scn_ = Scene(reader='satpy_cf_nc',
                      filenames=[_nc_filename])
@@ -282,14 +311,13 @@ class TestCFReader:
         """Check channels starting with digit is prefixed and read back correctly."""
         _cf_scene.save_datasets(writer='cf',
                                 filename=_nc_filename,
-                                engine='netcdf4',
-                                flatten_attrs=True,
-                                pretty=True)
-        scn_ = Scene(reader='satpy_cf_nc',
-                     filenames=[_nc_filename])
-        scn_.load(['1'])
-        np.testing.assert_array_equal(scn_['1'].data, _cf_scene['1'].data)
-        np.testing.assert_array_equal(scn_['1'].coords['lon'], _cf_scene['lon'].data)  # lon loaded as coord
+                                engine='h5netcdf')
+        scn_, ds_disk = _load_scene_and_disk_dataset(_nc_filename, ['1'])
+        with ds_disk:
+            np.testing.assert_array_equal(scn_['1'].data, _cf_scene['1'].data)
+            np.testing.assert_array_equal(scn_['1'].coords['lon'], _cf_scene['lon'].data)  # lon loaded as coord
+            # Check that variables starting with a digit is written to filename variable prefixed
+            np.testing.assert_array_equal(ds_disk['CHANNEL_1'].data, _cf_scene['1'].data)
 
         scn_ = Scene(reader='satpy_cf_nc',
                      filenames=[_nc_filename], reader_kwargs={})
@@ -297,10 +325,6 @@ class TestCFReader:
         np.testing.assert_array_equal(scn_['1'].data, _cf_scene['1'].data)
         np.testing.assert_array_equal(scn_['1'].coords['lon'], _cf_scene['lon'].data)  # lon loaded as coord
 
-        # Check that variables starting with a digit is written to filename variable prefixed
-        with xr.open_dataset(_nc_filename) as ds_disk:
-            np.testing.assert_array_equal(ds_disk['CHANNEL_1'].data, _cf_scene['1'].data)
-
     def test_read_prefixed_channels_include_orig_name(self, _cf_scene, _nc_filename):
         """Check channels starting with digit and includeed orig name is prefixed and read back correctly."""
         _cf_scene.save_datasets(writer='cf',
@@ -309,43 +333,36 @@ class TestCFReader:
                                 flatten_attrs=True,
                                 pretty=True,
                                 include_orig_name=True)
-        scn_ = Scene(reader='satpy_cf_nc',
-                     filenames=[_nc_filename])
-        scn_.load(['1'])
-        np.testing.assert_array_equal(scn_['1'].data, _cf_scene['1'].data)
-        np.testing.assert_array_equal(scn_['1'].coords['lon'], _cf_scene['lon'].data)  # lon loaded as coord
+        scn_, ds_disk = _load_scene_and_disk_dataset(_nc_filename, ['1'])
+        with ds_disk:
+            np.testing.assert_array_equal(scn_['1'].data, _cf_scene['1'].data)
+            np.testing.assert_array_equal(scn_['1'].coords['lon'], _cf_scene['lon'].data)  # lon loaded as coord
 
-        assert scn_['1'].attrs['original_name'] == '1'
+            assert scn_['1'].attrs['original_name'] == '1'
 
-        # Check that variables starting with a digit is written to filename variable prefixed
-        with xr.open_dataset(_nc_filename) as ds_disk:
+            # Check that variables starting with a digit is written to filename variable prefixed
             np.testing.assert_array_equal(ds_disk['CHANNEL_1'].data, _cf_scene['1'].data)
 
     def test_read_prefixed_channels_by_user(self, _cf_scene, _nc_filename):
         """Check channels starting with digit is prefixed by user and read back correctly."""
         _cf_scene.save_datasets(writer='cf',
                                 filename=_nc_filename,
-                                engine='netcdf4',
-                                flatten_attrs=True,
-                                pretty=True,
+                                engine='h5netcdf',
                                 numeric_name_prefix='USER')
-        scn_ = Scene(reader='satpy_cf_nc',
-                     filenames=[_nc_filename], reader_kwargs={'numeric_name_prefix': 'USER'})
-        scn_.load(['1'])
-        np.testing.assert_array_equal(scn_['1'].data, _cf_scene['1'].data)
-        np.testing.assert_array_equal(scn_['1'].coords['lon'], _cf_scene['lon'].data)  # lon loded as coord
+        scn_, ds_disk = _load_scene_and_disk_dataset(_nc_filename, ['1'],
+                                                     reader_kwargs={'numeric_name_prefix': 'USER'})
+        with ds_disk:
+            np.testing.assert_array_equal(scn_['1'].data, _cf_scene['1'].data)
+            np.testing.assert_array_equal(scn_['1'].coords['lon'], _cf_scene['lon'].data)  # lon loded as coord
 
-        # Check that variables starting with a digit is written to filename variable prefixed
-        with xr.open_dataset(_nc_filename) as ds_disk:
+            # Check that variables starting with a digit is written to filename variable prefixed
             np.testing.assert_array_equal(ds_disk['USER1'].data, _cf_scene['1'].data)
 
     def test_read_prefixed_channels_by_user2(self, _cf_scene, _nc_filename):
         """Check channels starting with digit is prefixed by user when saving and read back correctly without prefix."""
         _cf_scene.save_datasets(writer='cf',
                                 filename=_nc_filename,
-                                engine='netcdf4',
-                                flatten_attrs=True,
-                                pretty=True,
+                                engine='h5netcdf',
                                 include_orig_name=False,
                                 numeric_name_prefix='USER')
         scn_ = Scene(reader='satpy_cf_nc',
@@ -358,9 +375,7 @@ class TestCFReader:
         """Check channels starting with digit is prefixed by user and include original name when saving."""
         _cf_scene.save_datasets(writer='cf',
                                 filename=_nc_filename,
-                                engine='netcdf4',
-                                flatten_attrs=True,
-                                pretty=True,
+                                engine='h5netcdf',
                                 include_orig_name=True,
                                 numeric_name_prefix='USER')
         scn_ = Scene(reader='satpy_cf_nc',
@@ -375,9 +390,7 @@ class TestCFReader:
             warnings.filterwarnings("ignore", category=UserWarning, message=".*starts with a digit.*")
             _cf_scene.save_datasets(writer='cf',
                                     filename=_nc_filename,
-                                    engine='netcdf4',
-                                    flatten_attrs=True,
-                                    pretty=True,
+                                    engine='h5netcdf',
                                     numeric_name_prefix='')
         scn_ = Scene(reader='satpy_cf_nc',
                      filenames=[_nc_filename])
@@ -398,42 +411,38 @@ class TestCFReader:
         for key in orig_attrs:
             assert orig_attrs[key] == new_attrs[key]
 
-    def test_write_and_read_from_two_files(self, _nc_filename, _nc_filename_i):
+    def test_write_and_read_from_two_files(self, _default_test_netcdf, _nc_filename_i):
         """Save two datasets with different resolution and read the solar_zenith_angle again."""
-        _create_test_netcdf(_nc_filename, resolution=742)
         _create_test_netcdf(_nc_filename_i, resolution=371)
         scn_ = Scene(reader='satpy_cf_nc',
-                     filenames=[_nc_filename, _nc_filename_i])
+                     filenames=[_default_test_netcdf, _nc_filename_i])
         scn_.load(['solar_zenith_angle'], resolution=742)
         assert scn_['solar_zenith_angle'].attrs['resolution'] == 742
         scn_.unload()
         scn_.load(['solar_zenith_angle'], resolution=371)
         assert scn_['solar_zenith_angle'].attrs['resolution'] == 371
 
-    def test_dataid_attrs_equal_matching_dataset(self, _cf_scene, _nc_filename):
+    def test_dataid_attrs_equal_matching_dataset(self, _default_test_netcdf):
         """Check that get_dataset returns valid dataset when keys matches."""
         from satpy.dataset.dataid import DataID, default_id_keys_config
-        _create_test_netcdf(_nc_filename, resolution=742)
-        reader = SatpyCFFileHandler(_nc_filename, {}, {'filetype': 'info'})
+        reader = SatpyCFFileHandler(_default_test_netcdf, {}, {'filetype': 'info'})
         ds_id = DataID(default_id_keys_config, name='solar_zenith_angle', resolution=742, modifiers=())
         res = reader.get_dataset(ds_id, {})
         assert res.attrs['resolution'] == 742
 
-    def test_dataid_attrs_equal_not_matching_dataset(self, _cf_scene, _nc_filename):
+    def test_dataid_attrs_equal_not_matching_dataset(self, _default_test_netcdf):
         """Check that get_dataset returns None when key(s) are not matching."""
         from satpy.dataset.dataid import DataID, default_id_keys_config
-        _create_test_netcdf(_nc_filename, resolution=742)
-        reader = SatpyCFFileHandler(_nc_filename, {}, {'filetype': 'info'})
+        reader = SatpyCFFileHandler(_default_test_netcdf, {}, {'filetype': 'info'})
         not_existing_resolution = 9999999
         ds_id = DataID(default_id_keys_config, name='solar_zenith_angle', resolution=not_existing_resolution,
                        modifiers=())
         assert reader.get_dataset(ds_id, {}) is None
 
-    def test_dataid_attrs_equal_contains_not_matching_key(self, _cf_scene, _nc_filename):
+    def test_dataid_attrs_equal_contains_not_matching_key(self, _default_test_netcdf):
         """Check that get_dataset returns valid dataset when dataid have key(s) not existing in data."""
         from satpy.dataset.dataid import DataID, default_id_keys_config
-        _create_test_netcdf(_nc_filename, resolution=742)
-        reader = SatpyCFFileHandler(_nc_filename, {}, {'filetype': 'info'})
+        reader = SatpyCFFileHandler(_default_test_netcdf, {}, {'filetype': 'info'})
         ds_id = DataID(default_id_keys_config, name='solar_zenith_angle', resolution=742,
                        modifiers=(), calibration='counts')
         res = reader.get_dataset(ds_id, {})